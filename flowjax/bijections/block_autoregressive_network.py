@@ -1,22 +1,24 @@
 """Block Neural Autoregressive bijection implementation."""
 
 from collections.abc import Callable
-from math import prod
-from typing import ClassVar
+from typing import ClassVar, NamedTuple
 
 import equinox as eqx
 import jax
 import jax.numpy as jnp
 import jax.random as jr
+import numpy as np
 from jax import random
 from jax.nn import softplus
-from jaxtyping import PRNGKeyArray
+from jax.scipy.special import logsumexp
+from jaxtyping import Array, PRNGKeyArray
 
-from flowjax import masks
 from flowjax.bijections.bijection import AbstractBijection
+from flowjax.bijections.jax_transforms import _filter_scan
 from flowjax.bijections.tanh import LeakyTanh
 from flowjax.bisection_search import AutoregressiveBisectionInverter
-from flowjax.wrappers import Parameterize, WeightNormalization
+from flowjax.utils import inv_softplus
+from flowjax.wrappers import AbstractUnwrappable, Parameterize
 
 
 class _CallableToBijection(AbstractBijection):
@@ -75,7 +77,9 @@ class BlockAutoregressiveNetwork(AbstractBijection):
     shape: tuple[int, ...]
     cond_shape: tuple[int, ...] | None
     depth: int
-    layers: list
+    input_layer: "BlockAutoregressiveLinear"
+    hidden_layers: "BlockAutoregressiveLinear | None"
+    output_layer: "BlockAutoregressiveLinear | None"
     cond_linear: eqx.nn.Linear | None
     block_dim: int
     activation: AbstractBijection
@@ -106,75 +110,81 @@ class BlockAutoregressiveNetwork(AbstractBijection):
             AutoregressiveBisectionInverter() if inverter is None else inverter
         )
 
-        layers_and_log_jac_fns = []
+        # The hidden layers all have matching shapes, so are constructed with leading
+        # axis of size depth - 1, over which we scan.
         if depth == 0:
-            layers_and_log_jac_fns.append(
-                block_autoregressive_linear(
-                    key,
-                    n_blocks=dim,
-                    block_shape=(1, 1),
-                ),
+            self.input_layer = BlockAutoregressiveLinear(
+                key, n_blocks=dim, block_shape=(1, 1)
             )
+            self.hidden_layers, self.output_layer = None, None
         else:
-            keys = random.split(key, depth + 1)
-
-            block_shapes = [
-                (block_dim, 1),
-                *[(block_dim, block_dim)] * (depth - 1),
-                (1, block_dim),
-            ]
-
-            for layer_key, block_shape in zip(keys, block_shapes, strict=True):
-                layers_and_log_jac_fns.append(
-                    block_autoregressive_linear(
-                        layer_key,
-                        n_blocks=dim,
-                        block_shape=block_shape,
-                    ),
-                )
+            input_key, *hidden_keys, output_key = random.split(key, depth + 1)
+            self.input_layer = BlockAutoregressiveLinear(
+                input_key, n_blocks=dim, block_shape=(block_dim, 1)
+            )
+            self.hidden_layers = (
+                eqx.filter_vmap(
+                    lambda k: BlockAutoregressiveLinear(
+                        k, n_blocks=dim, block_shape=(block_dim, block_dim)
+                    )
+                )(jnp.stack(hidden_keys))
+                if depth > 1
+                else None
+            )
+            self.output_layer = BlockAutoregressiveLinear(
+                output_key, n_blocks=dim, block_shape=(1, block_dim)
+            )
 
         if cond_dim is not None:
-            layer0_out_dim = layers_and_log_jac_fns[0][0].out_features
             self.cond_linear = eqx.nn.Linear(
-                cond_dim, layer0_out_dim, use_bias=False, key=subkey
+                cond_dim, self.input_layer.out_features, use_bias=False, key=subkey
             )
         else:
             self.cond_linear = None
 
         self.depth = depth
-        self.layers = layers_and_log_jac_fns
         self.block_dim = block_dim
         self.shape = (dim,)
         self.cond_shape = None if cond_dim is None else (cond_dim,)
         self.activation = activation
 
     def transform(self, x, condition=None):
-        for i, (layer, _) in enumerate(self.layers[:-1]):
-            x = layer(x)
-            if i == 0 and condition is not None:
-                assert self.cond_linear is not None
-                x += self.cond_linear(condition)
+        def step(x, linear):
             x = eqx.filter_vmap(self.activation.transform)(x)
-        return self.layers[-1][0](x)
+            return linear(x), None
+
+        x = self.input_layer(x)
+        if self.output_layer is None:
+            return x
+        if condition is not None:
+            assert self.cond_linear is not None
+            x += self.cond_linear(condition)
+        if self.hidden_layers is not None:
+            x, _ = _filter_scan(step, x, self.hidden_layers)
+        x, _ = step(x, self.output_layer)
+        return x
 
     def transform_and_log_det(self, x, condition=None):
-        log_dets_3ds = []
-        for i, (linear, log_jacobian_fn) in enumerate(self.layers[:-1]):
+        # We accumulate the log block diagonal jacobian during the forward pass. As the
+        # first layer has blocks with shape (block_dim, 1), this gives a sequence of
+        # matrix-vector products, so we only store vectors with shape (blocks, size).
+        def step(carry, linear):
+            x, log_det = carry
+            x, log_jacobian_diag = self._activation_and_log_jacobian_diag(x)
+            log_det = log_det + log_jacobian_diag
             x = linear(x)
-            if i == 0 and condition is not None:
+            log_det = logmatvecexp(linear.log_jacobian_3d(), log_det)
+            return (x, log_det), None
+
+        x = self.input_layer(x)
+        log_det = self.input_layer.log_jacobian_3d()[..., 0]  # (blocks, block_dim)
+        if self.output_layer is not None:
+            if condition is not None:
                 assert self.cond_linear is not None
                 x += self.cond_linear(condition)
-            log_dets_3ds.append(log_jacobian_fn(linear))
-            x, log_det_3d = self._activation_and_log_jacobian_3d(x)
-            log_dets_3ds.append(log_det_3d)
-
-        linear, log_jacobian_fn = self.layers[-1]
-        x = linear(x)
-        log_dets_3ds.append(log_jacobian_fn(linear))
-
-        log_det = log_dets_3ds[-1]
-        for log_jacobian in reversed(log_dets_3ds[:-1]):
-            log_det = logmatmulexp(log_det, log_jacobian)
+            if self.hidden_layers is not None:
+                (x, log_det), _ = _filter_scan(step, (x, log_det), self.hidden_layers)
+            (x, log_det), _ = step((x, log_det), self.output_layer)
         return x, log_det.sum()
 
     def inverse(self, y, condition=None):
@@ -185,62 +195,153 @@ class BlockAutoregressiveNetwork(AbstractBijection):
         _, forward_log_det = self.transform_and_log_det(x, condition)
         return x, -forward_log_det
 
-    def _activation_and_log_jacobian_3d(self, x):
-        """Compute activation and the log determinant (blocks, block_dim, block_dim)."""
+    def _activation_and_log_jacobian_diag(self, x):
+        """Compute activation and the log jacobian diagonal (blocks, block_dim)."""
         x, log_abs_grads = eqx.filter_vmap(self.activation.transform_and_log_det)(x)
-        log_det_3d = jnp.full((self.shape[0], self.block_dim, self.block_dim), -jnp.inf)
-        diag_idxs = jnp.arange(self.block_dim)
-        log_det_3d = log_det_3d.at[:, diag_idxs, diag_idxs].set(
-            log_abs_grads.reshape(self.shape[0], self.block_dim)
-        )
-        return x, log_det_3d
+        return x, log_abs_grads.reshape(self.shape[0], self.block_dim)
 
 
-def block_autoregressive_linear(
-    key: PRNGKeyArray,
-    *,
-    n_blocks: int,
-    block_shape: tuple,
-) -> tuple[eqx.nn.Linear, Callable]:
+class BlockWeights(NamedTuple):
+    """The weight normalised blocks of a :class:`BlockAutoregressiveLinear` layer.
+
+    Attributes:
+        diag: The diagonal blocks, shape ``(n_blocks, *block_shape)``.
+        tril: The strictly lower triangular blocks, with shape
+            ``(n_blocks * (n_blocks - 1) // 2, *block_shape)``.
+        log_diag: The log of the diagonal blocks.
+    """
+
+    diag: Array
+    tril: Array
+    log_diag: Array
+
+
+class BlockAutoregressiveLinear(eqx.Module):
     """Block autoregressive linear layer (https://arxiv.org/abs/1904.04676).
 
-    Returns:
-        Tuple containing 1) an equinox.nn.Linear layer, with the weights wrapped
-        in order to provide a block lower triangular mask and weight normalisation.
-        2) callable taking the linear layer, returning the log block diagonal weights.
+    The weight matrix is block lower triangular, with positive diagonal blocks and
+    weight normalised rows. Rather than masking a dense weight matrix, only the
+    nonzero blocks are stored and used in the matrix multiplication: the diagonal
+    blocks with shape ``(n_blocks, *block_shape)``, and the strictly lower triangular
+    blocks with shape ``(n_blocks * (n_blocks - 1) // 2, *block_shape)``, ordered
+    to match the row and column indices from ``numpy.tril_indices(n_blocks, -1)``.
+
+    The positivity constraint and weight normalisation are applied when the layer is
+    unwrapped (see :func:`~flowjax.wrappers.unwrap`), giving :class:`BlockWeights`.
+    When evaluating a model repeatedly with fixed parameters (e.g. for sampling),
+    unwrapping the model once avoids recomputing the normalised weights on each call.
+
+    As the lower triangular blocks dominate the number of parameters for large
+    ``n_blocks``, they may be stored in a lower precision, e.g. for inference using
+    ``eqx.tree_at(lambda l: l.weights.kwargs["tril"], layer, replace_fn=lambda w:
+    w.astype(jnp.bfloat16))``. Normalisation is then carried out in the precision of
+    the diagonal blocks, and the outputs are accumulated in that precision. For blocks
+    with both dimensions greater than one, the inputs are rounded to the precision of
+    the lower triangular blocks for the matrix products.
 
     Args:
         key: Random key.
         n_blocks: Number of diagonal blocks (dimension of original input).
         block_shape: The shape of the blocks.
     """
-    out_features, in_features = (b * n_blocks for b in block_shape)
-    linear = eqx.nn.Linear(in_features, out_features, key=key)
-    block_diag_mask = masks.block_diag_mask(block_shape, n_blocks)
-    block_tril_mask = masks.block_tril_mask(block_shape, n_blocks)
-
-    def apply_mask(weight):
-        weight = jnp.where(block_tril_mask, weight, 0)
-        return jnp.where(block_diag_mask, softplus(weight), weight)
 
-    weight = WeightNormalization(Parameterize(apply_mask, linear.weight))
-    linear = eqx.tree_at(lambda linear: linear.weight, linear, replace=weight)
+    weights: BlockWeights | AbstractUnwrappable[BlockWeights]
+    bias: Array
+    n_blocks: int
+    block_shape: tuple[int, int]
 
-    def linear_to_log_block_diagonal(linear: eqx.nn.Linear):
-        idxs = jnp.where(block_diag_mask, size=prod(block_shape) * n_blocks)
-        jac_3d = linear.weight[idxs].reshape(n_blocks, *block_shape)
-        return jnp.log(jac_3d)
-
-    return linear, linear_to_log_block_diagonal
+    def __init__(
+        self,
+        key: PRNGKeyArray,
+        *,
+        n_blocks: int,
+        block_shape: tuple[int, int],
+    ):
+        self.n_blocks = n_blocks
+        self.block_shape = tuple(block_shape)
+        n_tril = n_blocks * (n_blocks - 1) // 2
+        lim = 1 / self.in_features**0.5  # Matches eqx.nn.Linear initialization
+        diag_key, tril_key, bias_key = jr.split(key, 3)
+
+        diag = jr.uniform(diag_key, (n_blocks, *block_shape), minval=-lim, maxval=lim)
+        tril = jr.uniform(tril_key, (n_tril, *block_shape), minval=-lim, maxval=lim)
+        scale_init = jax.lax.rsqrt(_sq_row_norms(softplus(diag), tril))
+        self.weights = Parameterize(
+            _normalise_blocks,
+            diag=Parameterize(softplus, diag),
+            tril=tril,
+            scale=Parameterize(softplus, inv_softplus(scale_init)),
+        )
+        self.bias = jr.uniform(bias_key, (self.out_features,), minval=-lim, maxval=lim)
+
+    def __call__(self, x: Array) -> Array:
+        """Apply the layer, assuming it has been unwrapped."""
+        diag, tril, _ = self.weights
+        rows, cols = np.tril_indices(self.n_blocks, -1)
+        x = x.reshape(self.n_blocks, self.block_shape[1])
+        y = _block_matvec(diag, x)
+        # Products with lower precision tril blocks are accumulated in the output dtype
+        y_tril = _block_matvec(tril, x[cols], dtype=y.dtype)
+        y = y + jax.ops.segment_sum(y_tril, rows, num_segments=self.n_blocks)
+        return y.ravel() + self.bias
+
+    def log_jacobian_3d(self) -> Array:
+        """Log diagonal blocks of the jacobian, shape ``(n_blocks, *block_shape)``."""
+        return self.weights.log_diag
+
+    @property
+    def in_features(self) -> int:
+        return self.n_blocks * self.block_shape[1]
+
+    @property
+    def out_features(self) -> int:
+        return self.n_blocks * self.block_shape[0]
+
+
+def _normalise_blocks(diag: Array, tril: Array, scale: Array) -> BlockWeights:
+    # Weight normalisation of the rows of the block lower triangular weight matrix.
+    # The log diagonal is computed in log space, avoiding the log of rescaled weights.
+    rows, _ = np.tril_indices(diag.shape[0], -1)
+    sq_norms = _sq_row_norms(diag, tril)
+    factor = scale * jax.lax.rsqrt(sq_norms)
+    log_factor = jnp.log(scale) - 0.5 * jnp.log(sq_norms)
+    return BlockWeights(
+        diag=diag * factor[..., None],
+        tril=(tril * factor[rows][..., None]).astype(tril.dtype),
+        log_diag=jnp.log(diag) + log_factor[..., None],
+    )
+
+
+def _sq_row_norms(diag: Array, tril: Array) -> Array:
+    # Squared norms of the rows of the dense weight matrix, computed from the blocks,
+    # with shape (n_blocks, block_shape[0])
+    rows, _ = np.tril_indices(diag.shape[0], -1)
+    tril = tril.astype(diag.dtype)
+    return jnp.sum(diag**2, axis=-1) + jax.ops.segment_sum(
+        jnp.sum(tril**2, axis=-1), rows, num_segments=diag.shape[0]
+    )
+
+
+def _block_matvec(blocks: Array, x: Array, dtype=None) -> Array:
+    # Matrix-vector products for blocks (n, b0, b1) and x (n, b1), accumulated in dtype
+    # (defaults to the promoted input dtype). The block shapes (b, 1) and (1, b) used in
+    # the first and last layers are computed by broadcasting in dtype. Otherwise, x is
+    # cast to the dtype of the blocks for the contraction.
+    dtype = jnp.result_type(blocks, x) if dtype is None else dtype
+    if blocks.shape[-1] == 1:
+        return blocks[..., 0].astype(dtype) * x.astype(dtype)
+    if blocks.shape[-2] == 1:
+        return jnp.sum(
+            blocks[..., 0, :].astype(dtype) * x.astype(dtype), axis=-1, keepdims=True
+        )
+    x = x.astype(blocks.dtype)
+    return jnp.einsum("bij,bj->bi", blocks, x, preferred_element_type=dtype)
 
 
-def logmatmulexp(x, y):
-    """Numerically stable version of ``(x.log() @ y.log()).exp()``.
+def logmatvecexp(x, y):
+    """Numerically stable version of ``log(exp(x) @ exp(y)[..., None])[..., 0]``.
 
-    From numpyro https://github.com/pyro-ppl/numpyro/blob/
-    f2ff89a3a7147617e185eb51148eb15d56d44661/numpyro/distributions/util.py#L387.
+    Computed row-wise using logsumexp, so no shifted exponentials or matrix
+    multiplications are materialized. Batch dimensions are supported.
     """
-    x_shift = jax.lax.stop_gradient(jnp.amax(x, -1, keepdims=True))
-    y_shift = jax.lax.stop_gradient(jnp.amax(y, -2, keepdims=True))
-    xy = jnp.log(jnp.matmul(jnp.exp(x - x_shift), jnp.exp(y - y_shift)))
-    return xy + x_shift + y_shift
+    return logsumexp(x + y[..., None, :], axis=-1)
@@ -1,13 +1,13 @@
 """Distributions, including the abstract and concrete classes."""
 
-import inspect
 from abc import abstractmethod
 from collections.abc import Callable
 from functools import wraps
-from math import prod
+from math import log, pi, prod
 from typing import ClassVar
 
 import equinox as eqx
+import jax
 import jax.numpy as jnp
 import jax.random as jr
 from equinox import AbstractVar
@@ -27,13 +27,15 @@ from flowjax.bijections import (
     TriangularAffine,
 )
 from flowjax.utils import (
-    _get_ufunc_signature,
     arraylike_to_array,
     inv_softplus,
     merge_cond_shapes,
 )
 from flowjax.wrappers import AbstractUnwrappable, Parameterize, unwrap
 
+_HALF_LOG_2PI = 0.5 * log(2 * pi)
+_LOG_2 = log(2)
+
 
 class AbstractDistribution(eqx.Module):
     """Abstract distribution class.
@@ -81,6 +83,11 @@ class AbstractDistribution(eqx.Module):
         x = self._sample(key, condition)
         return x, self._log_prob(x, condition)
 
+    def _safe_log_prob(self, x: Array, condition: Array | None = None) -> Array:
+        """Evaluate the log probability of point x, replacing nan with -inf."""
+        lp = self._log_prob(x, condition)
+        return jnp.where(jnp.isnan(lp), -jnp.inf, lp)
+
     def log_prob(self, x: ArrayLike, condition: ArrayLike | None = None) -> Array:
         """Evaluate the log probability.
 
@@ -97,8 +104,7 @@ class AbstractDistribution(eqx.Module):
         x = arraylike_to_array(x, err_name="x", dtype=float)
         if self.cond_shape is not None:
             condition = arraylike_to_array(condition, err_name="condition", dtype=float)
-        lps = self._vectorize(self._log_prob)(x, condition)
-        return jnp.where(jnp.isnan(lps), -jnp.inf, lps)
+        return self._vectorize(self._safe_log_prob)(x, condition)
 
     def sample(
         self,
@@ -172,8 +178,9 @@ class AbstractDistribution(eqx.Module):
 
         """
         self = unwrap(self)
-        if self.cond_shape is not None:
-            condition = arraylike_to_array(condition, err_name="condition")
+        if self.cond_shape is None:
+            return self._sample_batched(key, sample_shape)
+        condition = arraylike_to_array(condition, err_name="condition")
         keys = self._get_sample_keys(key, sample_shape, condition)
         return self._vectorize(self._sample)(keys, condition)
 
@@ -196,11 +203,31 @@ class AbstractDistribution(eqx.Module):
             sample_shape: Sample shape. Defaults to ().
         """
         self = unwrap(self)
-        if self.cond_shape is not None:
-            condition = arraylike_to_array(condition, err_name="condition")
+        if self.cond_shape is None:
+            return self._sample_and_log_prob_batched(key, sample_shape)
+        condition = arraylike_to_array(condition, err_name="condition")
         keys = self._get_sample_keys(key, sample_shape, condition)
         return self._vectorize(self._sample_and_log_prob)(keys, condition)
 
+    def _sample_batched(
+        self, key: PRNGKeyArray, sample_shape: tuple[int, ...]
+    ) -> Array:
+        """Sample an unconditional distribution, with leading shape ``sample_shape``.
+
+        By default, the key is split and ``_sample`` is vectorized over the keys.
+        Distributions that can generate a batch of samples in a single call can
+        override this.
+        """
+        keys = self._get_sample_keys(key, sample_shape, None)
+        return self._vectorize(self._sample)(keys, None)
+
+    def _sample_and_log_prob_batched(
+        self, key: PRNGKeyArray, sample_shape: tuple[int, ...]
+    ) -> tuple[Array, Array]:
+        """Batched version of ``_sample_and_log_prob``, see ``_sample_batched``."""
+        keys = self._get_sample_keys(key, sample_shape, None)
+        return self._vectorize(self._sample_and_log_prob)(keys, None)
+
     @property
     def ndim(self) -> int:
         """Number of dimensions in the distribution (the length of the shape)."""
@@ -212,43 +239,49 @@ class AbstractDistribution(eqx.Module):
         return None if self.cond_shape is None else len(self.cond_shape)
 
     def _vectorize(self, method: Callable) -> Callable:
-        """Returns a vectorized version of the distribution method."""
+        """Returns a vectorized version of the distribution method.
+
+        The leading dimensions of the arguments are broadcast and flattened to a
+        single batch dimension, over which the method is mapped with ``jax.vmap``.
+        """
         # Get shapes without broadcasting - note the (2, ) corresponds to key arrays.
-        maybe_cond = [] if self.cond_shape is None else [self.cond_shape]
-        in_shapes = {
-            "_sample_and_log_prob": [(2,)] + maybe_cond,
-            "_sample": [(2,)] + maybe_cond,
-            "_log_prob": [self.shape] + maybe_cond,
-        }
-        out_shapes = {
-            "_sample_and_log_prob": [self.shape, ()],
-            "_sample": [self.shape],
-            "_log_prob": [()],
-        }
-        in_shapes, out_shapes = in_shapes[method.__name__], out_shapes[method.__name__]
-
-        def _check_shapes(method):
-            # Wraps unvectorised method with shape checking
-            @wraps(method)
-            def _wrapper(*args, **kwargs):
-                bound = inspect.signature(method).bind(*args, **kwargs)
-                for in_shape, (name, arg) in zip(
-                    in_shapes,
-                    bound.arguments.items(),
-                    strict=False,
-                ):
-                    if arg.shape != in_shape:
-                        raise ValueError(
-                            f"Expected trailing dimensions matching {in_shape} for "
-                            f"{name}; got {arg.shape}.",
-                        )
-                return method(*args, **kwargs)
-
-            return _wrapper
-
-        signature = _get_ufunc_signature(in_shapes, out_shapes)
-        ex = frozenset([1]) if self.cond_shape is None else frozenset()
-        return jnp.vectorize(_check_shapes(method), signature=signature, excluded=ex)
+        in_shapes, arg_names = {
+            "_sample_and_log_prob": ([(2,), self.cond_shape], ["key", "condition"]),
+            "_sample": ([(2,), self.cond_shape], ["key", "condition"]),
+            "_log_prob": ([self.shape, self.cond_shape], ["x", "condition"]),
+            "_safe_log_prob": ([self.shape, self.cond_shape], ["x", "condition"]),
+        }[method.__name__]
+
+        @wraps(method)
+        def _vectorized(*args):
+            batch_shapes = []
+            for in_shape, name, arg in zip(in_shapes, arg_names, args, strict=True):
+                if in_shape is None:
+                    continue
+                if arg.shape[arg.ndim - len(in_shape) :] != in_shape:
+                    raise ValueError(
+                        f"Expected trailing dimensions matching {in_shape} for "
+                        f"{name}; got {arg.shape}.",
+                    )
+                batch_shapes.append(arg.shape[: arg.ndim - len(in_shape)])
+
+            batch_shape = jnp.broadcast_shapes(*batch_shapes)
+            if batch_shape == ():
+                return method(*args)
+
+            flat_args = [
+                None
+                if in_shape is None
+                else jnp.broadcast_to(arg, batch_shape + in_shape).reshape(
+                    (prod(batch_shape), *in_shape)
+                )
+                for in_shape, arg in zip(in_shapes, args, strict=True)
+            ]
+            in_axes = [None if arg is None else 0 for arg in flat_args]
+            result = jax.vmap(method, in_axes=in_axes)(*flat_args)
+            return tree_map(lambda r: r.reshape(batch_shape + r.shape[1:]), result)
+
+        return _vectorized
 
     def _get_sample_keys(
         self,
@@ -261,8 +294,9 @@ class AbstractDistribution(eqx.Module):
         else:
             leading_cond_shape = ()
         key_shape = sample_shape + leading_cond_shape
-        key_size = max(1, prod(key_shape))  # Still need 1 key for scalar sample
-        return jnp.reshape(jr.split(key, key_size), (*key_shape, 2))
+        if key_shape == ():
+            return key  # A single sample, so no need to split
+        return jnp.reshape(jr.split(key, prod(key_shape)), (*key_shape, 2))
 
 
 class AbstractTransformed(AbstractDistribution):
@@ -305,6 +339,20 @@ class AbstractTransformed(AbstractDistribution):
         )
         return sample, log_prob_base - forward_log_dets
 
+    def _sample_batched(self, key, sample_shape):
+        # Sample the base distribution in a batch, then vectorize the transform.
+        base_sample = self.base_dist._sample_batched(key, sample_shape)
+        return self.bijection._vectorize.transform(base_sample)
+
+    def _sample_and_log_prob_batched(self, key, sample_shape):
+        base_sample, log_prob_base = self.base_dist._sample_and_log_prob_batched(
+            key, sample_shape
+        )
+        sample, forward_log_dets = self.bijection._vectorize.transform_and_log_det(
+            base_sample
+        )
+        return sample, log_prob_base - forward_log_dets
+
     def __check_init__(self):  # TODO test errors and test conditional base distribution
         """Checks cond_shape is compatible in both bijection and distribution."""
         if (
@@ -391,7 +439,26 @@ class AbstractLocScaleDistribution(AbstractTransformed):
         return unwrap(self.bijection.scale)
 
 
-class StandardNormal(AbstractDistribution):
+class _AbstractStandardDistribution(AbstractDistribution):
+    """Unconditional distribution, which can generate a batch of samples at once.
+
+    Concrete subclasses define ``_sample_batched`` rather than ``_sample``, which is
+    used for any ``sample_shape``, avoiding splitting the key for each sample.
+    """
+
+    @abstractmethod
+    def _sample_batched(self, key, sample_shape):
+        """Sample the distribution, with leading shape ``sample_shape``."""
+
+    def _sample(self, key, condition=None):
+        return self._sample_batched(key, ())
+
+    def _sample_and_log_prob_batched(self, key, sample_shape):
+        x = self._sample_batched(key, sample_shape)
+        return x, self._vectorize(self._log_prob)(x, None)
+
+
+class StandardNormal(_AbstractStandardDistribution):
     """Standard normal distribution.
 
     Note unlike :class:`Normal`, this has no trainable parameters.
@@ -404,10 +471,10 @@ class StandardNormal(AbstractDistribution):
     cond_shape: ClassVar[None] = None
 
     def _log_prob(self, x, condition=None):
-        return jstats.norm.logpdf(x).sum()
+        return -0.5 * jnp.vdot(x, x) - x.size * _HALF_LOG_2PI
 
-    def _sample(self, key, condition=None):
-        return jr.normal(key, self.shape)
+    def _sample_batched(self, key, sample_shape):
+        return jr.normal(key, shape=sample_shape + self.shape)
 
 
 class Normal(AbstractLocScaleDistribution):
@@ -484,7 +551,7 @@ class MultivariateNormal(AbstractTransformed):
         return cholesky @ cholesky.T
 
 
-class _StandardUniform(AbstractDistribution):
+class _StandardUniform(_AbstractStandardDistribution):
     r"""Standard Uniform distribution."""
 
     shape: tuple[int, ...] = ()
@@ -493,8 +560,8 @@ class _StandardUniform(AbstractDistribution):
     def _log_prob(self, x, condition=None):
         return jstats.uniform.logpdf(x).sum()
 
-    def _sample(self, key, condition=None):
-        return jr.uniform(key, shape=self.shape)
+    def _sample_batched(self, key, sample_shape):
+        return jr.uniform(key, shape=sample_shape + self.shape)
 
 
 class Uniform(AbstractLocScaleDistribution):
@@ -529,7 +596,7 @@ class Uniform(AbstractLocScaleDistribution):
         return self.bijection.loc + unwrap(self.bijection.scale)
 
 
-class _StandardGumbel(AbstractDistribution):
+class _StandardGumbel(_AbstractStandardDistribution):
     """Standard gumbel distribution (https://en.wikipedia.org/wiki/Gumbel_distribution)."""
 
     shape: tuple[int, ...] = ()
@@ -538,8 +605,8 @@ class _StandardGumbel(AbstractDistribution):
     def _log_prob(self, x, condition=None):
         return -(x + jnp.exp(-x)).sum()
 
-    def _sample(self, key, condition=None):
-        return jr.gumbel(key, shape=self.shape)
+    def _sample_batched(self, key, sample_shape):
+        return jr.gumbel(key, shape=sample_shape + self.shape)
 
 
 class Gumbel(AbstractLocScaleDistribution):
@@ -562,7 +629,7 @@ class Gumbel(AbstractLocScaleDistribution):
         self.bijection = Affine(loc, scale)
 
 
-class _StandardCauchy(AbstractDistribution):
+class _StandardCauchy(_AbstractStandardDistribution):
     """Implements standard cauchy distribution (loc=0, scale=1).
 
     Ref: https://en.wikipedia.org/wiki/Cauchy_distribution.
@@ -574,8 +641,8 @@ class _StandardCauchy(AbstractDistribution):
     def _log_prob(self, x, condition=None):
         return jstats.cauchy.logpdf(x).sum()
 
-    def _sample(self, key, condition=None):
-        return jr.cauchy(key, shape=self.shape)
+    def _sample_batched(self, key, sample_shape):
+        return jr.cauchy(key, shape=sample_shape + self.shape)
 
 
 class Cauchy(AbstractLocScaleDistribution):
@@ -598,7 +665,7 @@ class Cauchy(AbstractLocScaleDistribution):
         self.bijection = Affine(loc, scale)
 
 
-class _StandardStudentT(AbstractDistribution):
+class _StandardStudentT(_AbstractStandardDistribution):
     """Implements student T distribution with specified degrees of freedom."""
 
     shape: tuple[int, ...]
@@ -614,8 +681,8 @@ class _StandardStudentT(AbstractDistribution):
     def _log_prob(self, x, condition=None):
         return jstats.t.logpdf(x, df=self.df).sum()
 
-    def _sample(self, key, condition=None):
-        return jr.t(key, df=self.df, shape=self.shape)
+    def _sample_batched(self, key, sample_shape):
+        return jr.t(key, df=self.df, shape=sample_shape + self.shape)
 
 
 class StudentT(AbstractLocScaleDistribution):
@@ -633,9 +700,9 @@ class StudentT(AbstractLocScaleDistribution):
     bijection: Affine
 
     def __init__(self, df: ArrayLike, loc: ArrayLike = 0, scale: ArrayLike = 1):
-        df, loc, scale = jnp.broadcast_arrays(df, loc, scale)
-        self.base_dist = _StandardStudentT(df)
-        self.bijection = Affine(loc, scale)
+        shape = jnp.broadcast_shapes(jnp.shape(df), jnp.shape(loc), jnp.shape(scale))
+        self.base_dist = _StandardStudentT(jnp.broadcast_to(df, shape))
+        self.bijection = Affine(jnp.broadcast_to(loc, shape), scale)
 
     @property
     def df(self):
@@ -643,17 +710,17 @@ class StudentT(AbstractLocScaleDistribution):
         return unwrap(self.base_dist.df)
 
 
-class _StandardLaplace(AbstractDistribution):
+class _StandardLaplace(_AbstractStandardDistribution):
     """Implements standard laplace distribution (loc=0, scale=1)."""
 
     shape: tuple[int, ...] = ()
     cond_shape: ClassVar[None] = None
 
     def _log_prob(self, x, condition=None):
-        return jstats.laplace.logpdf(x).sum()
+        return -jnp.abs(x).sum() - x.size * _LOG_2
 
-    def _sample(self, key, condition=None):
-        return jr.laplace(key, shape=self.shape)
+    def _sample_batched(self, key, sample_shape):
+        return jr.laplace(key, shape=sample_shape + self.shape)
 
 
 class Laplace(AbstractLocScaleDistribution):
@@ -675,15 +742,15 @@ class Laplace(AbstractLocScaleDistribution):
         self.bijection = Affine(loc, scale)
 
 
-class _StandardExponential(AbstractDistribution):
+class _StandardExponential(_AbstractStandardDistribution):
     shape: tuple[int, ...] = ()
     cond_shape: ClassVar[None] = None
 
     def _log_prob(self, x, condition=None):
         return jstats.expon.logpdf(x).sum()
 
-    def _sample(self, key, condition=None):
-        return jr.exponential(key, shape=self.shape)
+    def _sample_batched(self, key, sample_shape):
+        return jr.exponential(key, shape=sample_shape + self.shape)
 
 
 class Exponential(AbstractTransformed):
@@ -705,12 +772,12 @@ class Exponential(AbstractTransformed):
         return 1 / unwrap(self.bijection.scale)
 
 
-class _StandardLogistic(AbstractDistribution):
+class _StandardLogistic(_AbstractStandardDistribution):
     shape: tuple[int, ...] = ()
     cond_shape: ClassVar[None] = None
 
-    def _sample(self, key, condition=None):
-        return jr.logistic(key, self.shape)
+    def _sample_batched(self, key, sample_shape):
+        return jr.logistic(key, shape=sample_shape + self.shape)
 
     def _log_prob(self, x, condition=None):
         return jstats.logistic.logpdf(x).sum()
@@ -8,7 +8,7 @@ calculations.
 import operator
 
 import jax.numpy as jnp
-from jax.scipy.linalg import block_diag
+import numpy as np
 from jaxtyping import Array, Bool, Int
 
 
@@ -37,16 +37,15 @@ def rank_based_mask(
 
 def block_diag_mask(block_shape: tuple, n_blocks: int) -> Bool[Array, "dim1 dim2"]:
     """Block diagonal mask."""
-    return block_diag(*jnp.ones((n_blocks, *block_shape), bool))
+    mask = np.kron(np.eye(n_blocks, dtype=bool), np.ones(block_shape, dtype=bool))
+    return jnp.asarray(mask)
 
 
 def block_tril_mask(
     block_shape: tuple, n_blocks: int, k: int = 0
 ) -> Bool[Array, "dim1 dim2"]:
     """Lower triangular block mask, with offset k."""
-    mask = jnp.zeros((block_shape[0] * n_blocks, block_shape[1] * n_blocks), bool)
-    for i in range(n_blocks):
-        row_i = max(0, (i - k)) * block_shape[0]
-        col_i = i * block_shape[1]
-        mask = mask.at[row_i:, col_i : col_i + block_shape[1]].set(True)  # noqa
-    return mask
+    # Constructed with numpy, avoiding a scatter operation for each block
+    row_blocks = np.arange(block_shape[0] * n_blocks) // block_shape[0]
+    col_blocks = np.arange(block_shape[1] * n_blocks) // block_shape[1]
+    return jnp.asarray(row_blocks[:, None] + k >= col_blocks)
@@ -1,19 +1,20 @@
 """Function to fit flows to samples from a distribution."""
 
 from collections.abc import Callable
+from functools import partial
 
 import equinox as eqx
 import jax.numpy as jnp
 import jax.random as jr
 import jax
 import optax
+from jax.tree_util import tree_map
 from jaxtyping import ArrayLike, PRNGKeyArray, PyTree
 from tqdm import tqdm
 
 from flowjax import wrappers
 from flowjax.train.losses import MaximumLikelihoodLoss
 from flowjax.train.train_utils import (
-    count_fruitless,
     get_batches,
     step,
     train_val_split,
@@ -80,7 +81,7 @@ def fit_to_data(
         eqx.is_inexact_array,
         is_leaf=lambda leaf: isinstance(leaf, wrappers.NonTrainable),
     )
-    best_params = params
+    best_params, best_val_loss, best_epoch = params, float("inf"), 0
 
     if opt_state is None:
         opt_state = optimizer.init(params)
@@ -92,11 +93,13 @@ def fit_to_data(
 
     loop = tqdm(range(max_epochs), disable=not show_progress)
 
-    for _ in loop:
+    for epoch in loop:
         # Shuffle data
         key, *subkeys = jr.split(key, 3)
-        train_data = [jr.permutation(subkeys[0], a) for a in train_data]
-        val_data = [jr.permutation(subkeys[1], a) for a in val_data]
+        train_perm = jr.permutation(subkeys[0], train_data[0].shape[0])
+        val_perm = jr.permutation(subkeys[1], val_data[0].shape[0])
+        train_data = tree_map(partial(jnp.take, indices=train_perm, axis=0), train_data)
+        val_data = tree_map(partial(jnp.take, indices=val_perm, axis=0), val_data)
 
         key, subkey = jr.split(key)
         batches = get_batches(train_data, batch_size)
@@ -108,18 +111,16 @@ def fit_to_data(
         losses["train"].append(float(jnp.mean(batch_losses)))
 
         # Val epoch
-        batch_losses = []
-        for batch in zip(*get_batches(val_data, batch_size), strict=True):
-            key, subkey = jr.split(key)
-            loss_i = loss_fn(params, static, *batch, key=subkey)
-            batch_losses.append(loss_i)
-        losses["val"].append(sum(batch_losses) / len(batch_losses))
+        key, subkey = jr.split(key)
+        batches = get_batches(val_data, batch_size)
+        val_loss = _val_batch_loop(params, static, loss_fn, subkey, *batches)
+        losses["val"].append(float(val_loss))
 
         loop.set_postfix({k: v[-1] for k, v in losses.items()})
-        if losses["val"][-1] == min(losses["val"]):
-            best_params = params
+        if losses["val"][-1] <= best_val_loss:
+            best_params, best_val_loss, best_epoch = params, losses["val"][-1], epoch
 
-        elif count_fruitless(losses["val"]) > max_patience:
+        elif epoch - best_epoch > max_patience:
             loop.set_postfix_str(f"{loop.postfix} (Max patience reached)")
             break
 
@@ -130,7 +131,7 @@ def fit_to_data(
 
 @eqx.filter_jit
 def _step_batch_loop(params, static, opt_state, optimizer, loss_fn, key, *batches):
-    def scan_fn(carry, *batch):
+    def scan_fn(carry, batch):
         params, opt_state, key = carry
         key, subkey = jr.split(key)
         params, opt_state, loss_i = step(
@@ -145,7 +146,17 @@ def _step_batch_loop(params, static, opt_state, optimizer, loss_fn, key, *batche
         return (params, opt_state, key), loss_i
 
     (params, opt_state, _), batch_losses = jax.lax.scan(
-        scan_fn, (params, opt_state, key), *batches
+        scan_fn, (params, opt_state, key), batches
     )
 
     return params, opt_state, batch_losses
+
+
+@eqx.filter_jit
+def _val_batch_loop(params, static, loss_fn, key, *batches):
+    def map_fn(args):
+        key, batch = args
+        return loss_fn(params, static, *batch, key=key)
+
+    keys = jr.split(key, batches[0].shape[0])
+    return jnp.mean(jax.lax.map(map_fn, (keys, batches)))
@@ -115,7 +115,9 @@ class ElboLoss:
     """The negative evidence lower bound (ELBO), approximated using samples.
 
     Args:
-        num_samples: Number of samples to use in the ELBO approximation.
+        num_samples: Number of samples to use in the ELBO approximation. If memory
+            is limiting, fewer samples can be used per step, accumulating gradients
+            over several steps, e.g. with ``optax.MultiSteps``.
         target: The target, i.e. log posterior density up to an additive constant / the
             negative of the potential function, evaluated for a single point.
         stick_the_landing: Whether to use the (often) lower variance ELBO gradient
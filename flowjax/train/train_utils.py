@@ -1,13 +1,14 @@
 """Utility functions for training."""
 
-from collections.abc import Callable, Sequence
+from collections.abc import Callable
 from functools import partial
+from math import isnan
 
 import equinox as eqx
-import jax.numpy as jnp
 import jax.random as jr
 import optax
 from jax import jit
+from jax.tree_util import tree_leaves, tree_map
 from jaxtyping import Array, PRNGKeyArray, PyTree, Scalar, Shaped
 
 
@@ -49,14 +50,14 @@ def step(
 
 def train_val_split(
     key: PRNGKeyArray,
-    arrays: Sequence[Shaped[Array, "batch ..."]],
+    arrays: PyTree[Array],
     val_prop: float = 0.1,
 ):
-    """Random train validation split for a sequence of arrays.
+    """Random train validation split for a sequence (or pytree) of arrays.
 
     Args:
         key: Jax random key.
-        arrays: Sequence of arrays, with matching size on axis 0.
+        arrays: Sequence (or pytree) of arrays, with matching size on axis 0.
         val_prop: Proportion of data to use for validation. Defaults to 0.1.
 
     Returns:
@@ -65,20 +66,22 @@ def train_val_split(
     if not 0 <= val_prop <= 1:
         raise ValueError("val_prop should be between 0 and 1.")
 
-    num_samples = arrays[0].shape[0]
-    if not all(isinstance(a, Shaped[Array, " dim ..."]) for a in arrays):
+    leaves = tree_leaves(arrays)
+    num_samples = leaves[0].shape[0]
+    if not all(isinstance(a, Shaped[Array, " dim ..."]) for a in leaves):
         raise ValueError("Array dimensions must match along axis 0.")
 
     n_train = num_samples - round(val_prop * num_samples)
-    arrays = [jr.permutation(key, a) for a in arrays]
-    train_arrays = [arr[:n_train] for arr in arrays]
-    val_arrays = [arr[n_train:] for arr in arrays]
+    perm = jr.permutation(key, num_samples)
+    arrays = tree_map(lambda a: a[perm], arrays)
+    train_arrays = tree_map(lambda a: a[:n_train], arrays)
+    val_arrays = tree_map(lambda a: a[n_train:], arrays)
     return train_arrays, val_arrays
 
 
 @partial(jit, static_argnums=1)
-def get_batches(arrays: Sequence[Array], batch_size: int):
-    """Reshape a sequence of arrays to have an additional dimension for the batches.
+def get_batches(arrays: PyTree[Array], batch_size: int):
+    """Reshape a sequence (or pytree) of arrays to have an additional batch dimension.
 
     Specifically, this will transform an array with shape ``(data_len, *rest)`` to
     ``(num_batches, batch_size, *rest)``.
@@ -90,14 +93,15 @@ def get_batches(arrays: Sequence[Array], batch_size: int):
             batch size to be equal to the data length.
 
     Args:
-        arrays: Sequence of arrays, with shape matching on axis 0.
+        arrays: Sequence (or pytree) of arrays, with shape matching on axis 0.
         batch_size: The batch size.
     """
-    data_len = arrays[0].shape[0]
-    if not all(arr.shape[0] == data_len for arr in arrays):
+    leaves = tree_leaves(arrays)
+    data_len = leaves[0].shape[0]
+    if not all(arr.shape[0] == data_len for arr in leaves):
         raise ValueError("Array dimensions do not match along the batch axis.")
 
-    return tuple(_add_batch(arr, batch_size) for arr in arrays)
+    return tree_map(partial(_add_batch, batch_size=batch_size), arrays)
 
 
 def _add_batch(arr, batch_size):
@@ -110,9 +114,12 @@ def _add_batch(arr, batch_size):
 def count_fruitless(losses: list[float]) -> int:
     """Count the number of epochs since the minimum loss in a list of losses.
 
+    As with ``jnp.argmin``, the first occurrence of the minimum is used, and nan
+    values are treated as the minimum.
+
     Args:
         losses: List of losses.
 
     """
-    min_idx = jnp.argmin(jnp.array(losses)).item()
+    min_idx = min(range(len(losses)), key=lambda i: (not isnan(losses[i]), losses[i]))
     return len(losses) - min_idx - 1
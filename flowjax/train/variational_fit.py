@@ -3,6 +3,8 @@
 from collections.abc import Callable
 
 import equinox as eqx
+import jax
+import jax.numpy as jnp
 import jax.random as jr
 import optax
 from jaxtyping import PRNGKeyArray, PyTree
@@ -11,6 +13,8 @@ from tqdm import tqdm
 from flowjax import wrappers
 from flowjax.train.train_utils import step
 
+_STEPS_PER_SCAN = 50
+
 
 def fit_to_variational_target(
     key: PRNGKeyArray,
@@ -52,12 +56,59 @@ def fit_to_variational_target(
     )
     opt_state = optimizer.init(params)
 
+    # Steps are run in chunks, each as a single scan, with the best parameters
+    # selected on device. The progress bar is updated after each chunk. The keys are
+    # padded to a whole number of chunks, with the padded steps skipped in the last
+    # chunk, so the scan is only compiled once.
+    best_params, best_loss = params, jnp.asarray(jnp.inf)
+    keys = jr.split(key, steps)
+    n_padded = -(-steps // _STEPS_PER_SCAN) * _STEPS_PER_SCAN
+    keys = keys[jnp.minimum(jnp.arange(n_padded), steps - 1)]
     losses = []
 
-    best_params = params
-    keys = tqdm(jr.split(key, steps), disable=not show_progress)
+    with tqdm(total=steps, disable=not show_progress) as pbar:
+        for start in range(0, steps, _STEPS_PER_SCAN):
+            n_valid = min(_STEPS_PER_SCAN, steps - start)
+            params, opt_state, best_params, best_loss, chunk_losses = _step_scan(
+                params,
+                static,
+                opt_state,
+                best_params,
+                best_loss,
+                keys[start : start + _STEPS_PER_SCAN],
+                jnp.asarray(n_valid),
+                optimizer=optimizer,
+                loss_fn=loss_fn,
+                return_best=return_best,
+            )
+            chunk_losses = chunk_losses[:n_valid]
+            losses.append(chunk_losses)
+            pbar.update(len(chunk_losses))
+            if show_progress:
+                pbar.set_postfix({"loss": chunk_losses[-1].item()})
+
+    losses = jnp.concatenate(losses).tolist() if losses else []
+    params = best_params if return_best else params
+    return eqx.combine(params, static), losses
+
 
-    for key in keys:
+@eqx.filter_jit
+def _step_scan(
+    params,
+    static,
+    opt_state,
+    best_params,
+    best_loss,
+    keys,
+    n_valid,
+    *,
+    optimizer,
+    loss_fn,
+    return_best,
+):
+    # Steps with index >= n_valid are skipped, and their losses set to nan.
+    def step_fn(carry, key):
+        params, opt_state, best_params, best_loss = carry
         params, opt_state, loss = step(
             params,
             static,
@@ -66,9 +117,24 @@ def fit_to_variational_target(
             opt_state=opt_state,
             loss_fn=loss_fn,
         )
-        losses.append(loss.item())
-        keys.set_postfix({"loss": loss.item()})
-        if loss.item() == min(losses):
-            best_params = params
-    params = best_params if return_best else params
-    return eqx.combine(params, static), losses
+        if return_best:
+            is_best = loss <= best_loss
+            best_params = jax.tree_util.tree_map(
+                lambda p, b: jnp.where(is_best, p, b), params, best_params
+            )
+            best_loss = jnp.where(is_best, loss, best_loss)
+        return (params, opt_state, best_params, best_loss), loss
+
+    def skip_fn(carry, key):
+        return carry, jnp.full_like(carry[-1], jnp.nan)
+
+    def scan_fn(carry, xs):
+        i, key = xs
+        return jax.lax.cond(i < n_valid, step_fn, skip_fn, carry, key)
+
+    (params, opt_state, best_params, best_loss), losses = jax.lax.scan(
+        scan_fn,
+        (params, opt_state, best_params, best_loss),
+        (jnp.arange(len(keys)), keys),
+    )
+    return params, opt_state, best_params, best_loss, losses
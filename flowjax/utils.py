@@ -3,6 +3,7 @@
 from collections.abc import Sequence
 
 import equinox as eqx
+import jax
 import jax.numpy as jnp
 from jax.flatten_util import ravel_pytree
 from jaxtyping import Array, ArrayLike
@@ -114,6 +115,12 @@ def arraylike_to_array(
         err_name: Name of the input in the error message. Defaults to "input".
         **kwargs: Keyword arguments passed to jnp.asarray.
     """
+    if isinstance(arr, Array) and not arr.weak_type and kwargs.keys() <= {"dtype"}:
+        # Avoid the conversion if already a (strongly typed) jax array of the requested
+        # dtype. Weakly typed arrays are converted, so they become strongly typed.
+        dtype = kwargs.get("dtype")
+        if dtype is None or arr.dtype == jax.dtypes.canonicalize_dtype(dtype):
+            return arr
     if not isinstance(arr, ArrayLike):
         raise TypeError(
             f"Expected {err_name} to be arraylike; got {type(arr).__name__}.",
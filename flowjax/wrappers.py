@@ -177,9 +177,12 @@ class WeightNormalization(AbstractUnwrappable[Array]):
 
     def __init__(self, weight: Array | AbstractUnwrappable[Array]):
         self.weight = weight
-        scale_init = 1 / jnp.linalg.norm(unwrap(weight), axis=-1, keepdims=True)
+        scale_init = _inv_row_norms(unwrap(weight))
         self.scale = Parameterize(softplus, inv_softplus(scale_init))
 
     def unwrap(self) -> Array:
-        weight_norms = jnp.linalg.norm(self.weight, axis=-1, keepdims=True)
-        return self.scale * self.weight / weight_norms
+        return (self.scale * _inv_row_norms(self.weight)) * self.weight
+
+
+def _inv_row_norms(weight: Array) -> Array:
+    return lax.rsqrt(jnp.sum(weight**2, axis=-1, keepdims=True))
@@ -139,6 +139,13 @@ bijections = {
         block_dim=3,
         depth=1,
     ),
+    "BlockAutoregressiveNetwork (deep)": lambda: BlockAutoregressiveNetwork(
+        KEY,
+        dim=DIM,
+        cond_dim=COND_DIM,
+        block_dim=3,
+        depth=3,
+    ),
     "AdditiveCondtition": lambda: AdditiveCondition(
         lambda condition: jnp.arange(DIM) * jnp.sum(condition),
         (DIM,),
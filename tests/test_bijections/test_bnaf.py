@@ -1,27 +1,72 @@
+import equinox as eqx
 import jax
 import jax.numpy as jnp
 import pytest
 from jax import random
 
 from flowjax.bijections.block_autoregressive_network import (
+    BlockAutoregressiveLinear,
     BlockAutoregressiveNetwork,
-    block_autoregressive_linear,
 )
 from flowjax.wrappers import unwrap
 
 
 def test_block_autoregressive_linear():
     block_shape = (3, 2)
-    linear, log_jac_3d_fn = block_autoregressive_linear(
+    linear = BlockAutoregressiveLinear(
         jax.random.PRNGKey(0),
         n_blocks=3,
         block_shape=block_shape,
     )
-    linear = unwrap(linear)  # Applies masking
-    log_jac_3d = log_jac_3d_fn(linear)
+    scale = unwrap(linear.weights.kwargs["scale"])
+    linear = unwrap(linear)  # Applies positivity constraint and weight normalisation
+    log_jac_3d = linear.log_jacobian_3d()
     assert log_jac_3d.shape == (3, *block_shape)
     assert jnp.all(jnp.isfinite(log_jac_3d))
 
+    # Block lower triangular jacobian, with weight normalised rows
+    jac = jax.jacobian(linear)(jnp.ones(linear.in_features))
+    assert jac.shape == (linear.out_features, linear.in_features)
+    assert jnp.all(jac[:3, 2:] == 0)
+    assert jnp.all(jac[3:6, 4:] == 0)
+    assert jnp.linalg.norm(jac, axis=-1) == pytest.approx(scale.ravel(), rel=1e-5)
+
+    # Diagonal blocks match those of the dense jacobian
+    dense_blocks = jac.reshape(3, block_shape[0], 3, block_shape[1])
+    dense_blocks = dense_blocks[jnp.arange(3), :, jnp.arange(3)]
+    assert log_jac_3d == pytest.approx(jnp.log(dense_blocks), rel=1e-5)
+
+
+@pytest.mark.parametrize("block_shape", [(3, 3), (8, 64), (1, 64), (64, 1)])
+def test_block_autoregressive_linear_low_precision_tril(block_shape):
+    linear = BlockAutoregressiveLinear(
+        jax.random.PRNGKey(0), n_blocks=4, block_shape=block_shape
+    )
+    low_precision = eqx.tree_at(
+        lambda linear: linear.weights.kwargs["tril"],
+        linear,
+        replace_fn=lambda w: w.astype(jnp.bfloat16),
+    )
+    linear, low_precision = unwrap((linear, low_precision))
+    # Same (bf16 rounded) blocks in float32, so the only difference is accumulation
+    reference = eqx.tree_at(
+        lambda linear: linear.weights.tril,
+        low_precision,
+        replace_fn=lambda w: w.astype(jnp.float32),
+    )
+    x = jax.random.normal(jax.random.PRNGKey(1), (linear.in_features,))
+    y = low_precision(x)
+    assert y.dtype == linear(x).dtype
+
+    if 1 in block_shape:
+        # Products computed in float32, so no rounding of the inputs
+        assert y == pytest.approx(reference(x), abs=1e-5)
+    else:
+        # Inputs are rounded to bf16 for the contraction with the tril blocks
+        assert y == pytest.approx(reference(x), abs=1e-3)
+        x = x.astype(jnp.bfloat16).astype(x.dtype)  # Exactly representable in bf16
+        assert low_precision(x) == pytest.approx(reference(x), abs=1e-5)
+
 
 def test_BlockAutoregressiveNetwork():
     dim = 3
@@ -202,6 +202,14 @@ def test_sample_and_log_prob(dist):
     assert x == pytest.approx(x_naive)
     assert lp == pytest.approx(lp_naive)
 
+    # Batched sampling
+    sample_shape = (3,)
+    x_naive = dist.sample(key, sample_shape)
+    lp_naive = dist.log_prob(x_naive)
+    x, lp = dist.sample_and_log_prob(key, sample_shape)
+    assert x == pytest.approx(x_naive)
+    assert lp == pytest.approx(lp_naive)
+
 
 def test_transformed_merge_transforms():
     shape = (3, 3)
@@ -4,6 +4,7 @@ from jax import random
 
 from flowjax.bijections import Affine
 from flowjax.distributions import Normal, Transformed
+from flowjax.flows import masked_autoregressive_flow
 from flowjax.train.data_fit import fit_to_data
 
 
@@ -27,3 +28,23 @@ def test_data_fit():
 
     assert jnp.all(before.base_dist.bijection.loc != after.base_dist.bijection.loc)
     assert jnp.all(before.bijection.loc != after.bijection.loc)
+
+
+def test_data_fit_conditional():
+    dim, cond_dim = 2, 1
+    flow = masked_autoregressive_flow(
+        random.PRNGKey(0), base_dist=Normal(jnp.zeros(dim)), cond_dim=cond_dim
+    )
+    x = random.normal(random.PRNGKey(0), (100, dim))
+    condition = random.normal(random.PRNGKey(1), (100, cond_dim))
+    _, losses, _ = fit_to_data(
+        random.PRNGKey(0),
+        dist=flow,
+        x=x,
+        condition=condition,
+        max_epochs=2,
+        batch_size=50,
+        show_progress=False,
+    )
+    assert len(losses["train"]) == 2
+    assert all(jnp.isfinite(loss) for loss in losses["train"] + losses["val"])
@@ -36,9 +36,24 @@ def test_count_fruitless():
     assert count_fruitless([12.0, 2.0, 3.0, 4.0]) == 2
     assert count_fruitless([0.0]) == 0.0
     assert count_fruitless([0.0, 12.0]) == 1
+    assert count_fruitless([1.0, float("nan"), 0.5]) == 1
+    assert count_fruitless([float("nan"), 1.0, float("nan")]) == 2
 
 
 def test_get_batches():
     arrays = [jnp.arange(26).reshape(13, 2)] * 2
     out = get_batches(arrays, batch_size=4)
     assert out[0].shape == (3, 4, 2)
+
+
+def test_pytree_inputs():
+    key = jr.PRNGKey(0)
+    arrays = {"x": jnp.arange(10), "condition": jnp.arange(20).reshape(10, 2)}
+    train, val = train_val_split(key, arrays, val_prop=0.2)
+    assert train["x"].shape == (8,)
+    assert val["condition"].shape == (2, 2)
+    assert jnp.all(train["condition"][:, 0] == 2 * train["x"])  # Same permutation
+
+    batches = get_batches(train, batch_size=3)
+    assert batches["x"].shape == (2, 3)
+    assert batches["condition"].shape == (2, 3, 2)
@@ -39,3 +39,16 @@ def test_fit_to_variational_target(shape):
     # We expect the loss to be decreasing
     start, end = jnp.split(jnp.array(losses), 2)
     assert jnp.mean(start) > jnp.mean(end)
+
+
+def test_fit_to_variational_target_partial_chunk():
+    "Check steps not divisible by the scan chunk size."
+    _, losses = fit_to_variational_target(
+        key=jr.PRNGKey(0),
+        dist=Normal(jnp.ones(2)),
+        loss_fn=ElboLoss(StandardNormal((2,)).log_prob, 10),
+        steps=55,
+        show_progress=False,
+    )
+    assert len(losses) == 55
+    assert jnp.all(jnp.isfinite(jnp.array(losses)))
@@ -1,7 +1,7 @@
 import jax.numpy as jnp
 import pytest
 
-from flowjax.utils import _get_ufunc_signature, merge_cond_shapes
+from flowjax.utils import _get_ufunc_signature, arraylike_to_array, merge_cond_shapes
 
 test_cases = [
     # arrays, expected_shape
@@ -47,3 +47,13 @@ test_cases = [
 @pytest.mark.parametrize(("input_", "expected"), test_cases)
 def test_get_ufunc_signature(input_, expected):
     assert _get_ufunc_signature(*input_) == expected
+
+
+def test_arraylike_to_array():
+    arr = jnp.ones(3)
+    assert arraylike_to_array(arr, dtype=float) is arr
+
+    weak = jnp.asarray(0.0)
+    assert weak.weak_type
+    assert not arraylike_to_array(weak, dtype=float).weak_type
+    assert arraylike_to_array(jnp.arange(3), dtype=float).dtype == jnp.ones(()).dtype